@@ -60,3 +60,111 @@ def Day1_Part2(input_file: str='Inputs/Day1_Inputs.txt') -> int:
         d %= 100
     
     return num_passed_zero
+
+import numpy as np
+
+def get_input_array(input_file: str='Inputs/Day1_Inputs.txt') -> tuple:
+    # Extract turns from input file as array of strings
+    with open(input_file) as f:
+        turns = np.array(f.read().split(), dtype=str)
+    # Extract direction from first character of each turn
+    directions = turns.astype('U1')
+    if not np.isin(directions, ['L', 'R']).all():
+        raise Exception(f"Unrecognised code {directions[~np.isin(directions, ['L', 'R'])][0]}!")
+    # Convert to signed turn values, left turns negative, and keep direction separately so
+    # zero-length left turns are still recognised
+    left = directions == 'L'
+    values = np.char.lstrip(turns, 'LR').astype(np.int64)
+
+    return np.where(left, -values, values), left
+
+def Day1_Part1_Vectorized(input_file: str='Inputs/Day1_Inputs.txt') -> int:
+    # Parse input file and extract signed turns
+    turns, _ = get_input_array(input_file)
+    # Find wrapped position after every turn, starting at position 50
+    d = (50 + np.cumsum(turns))%100
+    # Count zeroes
+    return int(np.count_nonzero(d == 0))
+
+def Day1_Part2_Vectorized(input_file: str='Inputs/Day1_Inputs.txt') -> int:
+    # Parse input file and extract signed turns
+    turns, left = get_input_array(input_file)
+    # Find wrapped position before every turn, starting at position 50
+    d_start = np.concatenate(([50], (50 + np.cumsum(turns[:-1]))%100)).astype(np.int64)
+    # Move in given direction, but don't wrap yet
+    d = d_start + turns
+    # Count number of multiples of 100 in each turn
+    num_passed_zero = np.abs(d//100).sum()
+    # If turning left and landing on zero, correct for undercount
+    num_passed_zero += np.count_nonzero((d <= 0) & (d%100 == 0))
+    # If turning left and started at zero, correct for overcount
+    num_passed_zero -= np.count_nonzero(left & (d_start == 0))
+
+    return int(num_passed_zero)
+
+import json
+import os
+
+def read_turns(input_file: str='Inputs/Day1_Inputs.txt', offset: int=0, chunk_size: int=1 << 16,
+               final: bool=True):
+    # Lazily yield turns from input file, reading in fixed-size chunks starting at a byte offset,
+    # along with the byte offset just after each turn
+    with open(input_file, 'rb') as f:
+        f.seek(offset)
+        # Store any incomplete line left at the end of the previous chunk
+        partial = b''
+        while chunk := f.read(chunk_size):
+            lines = (partial + chunk).split(b'\n')
+            partial = lines.pop()
+            for l in lines:
+                offset += len(l) + 1
+                if l.strip():
+                    yield l.strip().decode(), offset
+        # Only yield an unterminated final line if the file is not still being appended to,
+        # otherwise leave it to be read once it is complete
+        if final and partial.strip():
+            yield partial.strip().decode(), offset + len(partial)
+
+def turn_dial(state: dict, t: str) -> dict:
+    # Move in given direction, but don't wrap yet
+    if t[0] == 'L':
+        d = state['d'] - int(t[1:])
+    elif t[0] == 'R':
+        d = state['d'] + int(t[1:])
+    else:
+        raise Exception(f"Unrecognised code {t[0]}!")
+    # Count zeroes (part 1)
+    if d%100 == 0:
+        state['num_zero'] += 1
+    # Count number of multiples of 100 in given turn (part 2)
+    state['num_passed_zero'] += abs(d//100)
+    # If turning left and landing on zero, correct for undercount
+    if d <= 0 and d%100 == 0:
+        state['num_passed_zero'] += 1
+    # If turning left and started at zero, correct for overcount
+    if t[0] == 'L' and state['at_zero']:
+        state['num_passed_zero'] -= 1
+    # Update whether at zero and apply wrapping at 100
+    state['at_zero'] = d%100 == 0
+    state['d'] = d%100
+
+    return state
+
+def Day1_Stream(input_file: str='Inputs/Day1_Inputs.txt', checkpoint_file: str=None,
+                chunk_size: int=1 << 16) -> tuple:
+    # Start at position 50 with no zeroes counted, or resume from checkpoint if one exists
+    state = {'offset': 0, 'd': 50, 'num_zero': 0, 'num_passed_zero': 0, 'at_zero': False}
+    if checkpoint_file and os.path.exists(checkpoint_file):
+        with open(checkpoint_file) as f:
+            state = json.load(f)
+    # Lazily read and apply only the turns after the checkpoint, if checkpointing the log may
+    # still be being written so never read an unterminated final line
+    for t, offset in read_turns(input_file, state['offset'], chunk_size, not checkpoint_file):
+        state = turn_dial(state, t)
+        state['offset'] = offset
+    # Save dial state and byte offset reached so the next run only reads new turns
+    if checkpoint_file:
+        with open(checkpoint_file, 'w') as f:
+            json.dump(state, f)
+
+    return state['num_zero'], state['num_passed_zero']
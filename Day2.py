@@ -32,9 +32,14 @@ def get_input(input_file: str='Inputs/Day2_Inputs.txt', strings=False) -> list:
     return id_ranges
 
 @time_function
-def Day2_Part1(input_file: str='Inputs/Day2_Inputs.txt') -> int:
+def Day2_Part1(input_file: str='Inputs/Day2_Inputs.txt', backend: str='loop') -> int:
     # Parse input file and extract range bounds
     id_ranges = get_input(input_file)
+    # Option to check blocks of IDs as arrays instead, fix to 2 segments
+    if backend == 'numpy':
+        return sum(sum_invalid_batched(id_range, fix_num_rep=2) for id_range in id_ranges)
+    elif backend != 'loop':
+        raise Exception(f"Unrecognised backend {backend}")
     # Sum invalid IDs
     invalid_sum = 0
     for id_range in id_ranges:
@@ -79,9 +84,14 @@ def is_invalid(i):
 from tqdm import tqdm
 
 @time_function
-def Day2_Part2(input_file: str='Inputs/Day2_Inputs.txt') -> int:
+def Day2_Part2(input_file: str='Inputs/Day2_Inputs.txt', backend: str='loop') -> int:
     # Parse input file and extract range bounds
     id_ranges = get_input(input_file)
+    # Option to check blocks of IDs as arrays instead
+    if backend == 'numpy':
+        return sum(sum_invalid_batched(id_range) for id_range in tqdm(id_ranges))
+    elif backend != 'loop':
+        raise Exception(f"Unrecognised backend {backend}")
     # Sum invalid IDs
     invalid_sum = 0
     for id_range in tqdm(id_ranges):
@@ -166,3 +176,250 @@ def Day2_Part2_Fast(input_file: str='Inputs/Day2_Inputs.txt') -> int:
 
     return invalid_sum
     
+
+def mobius(n):
+    # Calculate Mobius function of n by trial division
+    mu = 1
+    p = 2
+    while p*p <= n:
+        if n%p == 0:
+            n //= p
+            # Any squared prime factor gives zero
+            if n%p == 0:
+                return 0
+            mu = -mu
+        p += 1
+    # Remaining factor is prime
+    if n > 1:
+        mu = -mu
+
+    return mu
+
+def sum_repeating(low, high, id_len, rep_len):
+    # Sum all IDs of length id_len within [low, high] made by repeating a segment of length rep_len
+    # These are of the form seg*mult, e.g. 1010101 for a segment of length 2 repeated 4 times
+    mult = (10**id_len - 1)//(10**rep_len - 1)
+    # Find bounds of segments giving IDs within the range, segments can't have leading zeroes
+    seg_low = max(10**(rep_len-1), -(-low//mult))
+    seg_high = min(10**rep_len - 1, high//mult)
+    if seg_low > seg_high:
+        return 0
+    # Sum arithmetic series of segments and scale by multiplier
+    return mult*(seg_low + seg_high)*(seg_high - seg_low + 1)//2
+
+def sum_invalid_closed_form(id_range, fix_num_rep=None):
+    # Alternate approach where the sum of all invalid IDs in a range is calculated directly as
+    # arithmetic series, so cost depends only on the number of digits, not the width of the range
+    invalid_sum = 0
+    low, high = int(id_range[0]), int(id_range[1])
+    # Loop over each ID length covered by the range, splitting at powers of 10
+    for id_len in range(len(str(low)), len(str(high))+1):
+        r_low, r_high = max(low, 10**(id_len-1)), min(high, 10**id_len - 1)
+        # Option to fix number of repeated segments (for part 1)
+        if fix_num_rep:
+            if not id_len%fix_num_rep:
+                invalid_sum += sum_repeating(r_low, r_high, id_len, id_len//fix_num_rep)
+            continue
+        # IDs repeating with a segment of length d also repeat with any multiple of d, so remove
+        # double counting using inclusion-exclusion over divisors of ID length (Mobius inversion)
+        for rep_len in range(1, id_len):
+            if not id_len%rep_len:
+                invalid_sum -= mobius(id_len//rep_len)*sum_repeating(r_low, r_high, id_len, rep_len)
+
+    return invalid_sum
+
+@time_function
+def Day2_Part1_ClosedForm(input_file: str='Inputs/Day2_Inputs.txt') -> int:
+    # Parse input file and extract range bounds
+    id_ranges = get_input(input_file)
+    # Sum invalid IDs from each range, fix to 2 segments
+    return sum(sum_invalid_closed_form(id_range, fix_num_rep=2) for id_range in id_ranges)
+
+@time_function
+def Day2_Part2_ClosedForm(input_file: str='Inputs/Day2_Inputs.txt') -> int:
+    # Parse input file and extract range bounds
+    id_ranges = get_input(input_file)
+    # Sum invalid IDs from each range
+    return sum(sum_invalid_closed_form(id_range) for id_range in id_ranges)
+
+import os
+
+def build_invalid_index(max_digits=12, fix_num_rep=None):
+    # Construct sorted array of every invalid ID with up to max_digits digits, along with prefix
+    # sums so the sum over any range can be found with two bisects
+    # Check prefix sums will fit in int64
+    if sum_invalid_closed_form((1, 10**max_digits - 1), fix_num_rep) >= 2**63:
+        raise Exception(f"Prefix sums for {max_digits} digits overflow int64!")
+    invalid_ids = []
+    for id_len in range(2, max_digits+1):
+        # Option to fix number of repeated segments (for part 1)
+        if fix_num_rep:
+            if id_len%fix_num_rep:
+                continue
+            rep_lens = [id_len//fix_num_rep]
+        else:
+            rep_lens = [rep_len for rep_len in range(1, id_len) if not id_len%rep_len]
+        for rep_len in rep_lens:
+            # Build every ID made by repeating a segment of this length, e.g. seg*1010101
+            mult = (10**id_len - 1)//(10**rep_len - 1)
+            invalid_ids.append(np.arange(10**(rep_len-1), 10**rep_len, dtype=np.int64)*mult)
+    # Sort and remove IDs made by more than one segment length
+    invalid_ids = np.unique(np.concatenate(invalid_ids))
+    # Prefix sums with leading zero, so sum of IDs [i, j) is sums[j] - sums[i]
+    invalid_sums = np.zeros(len(invalid_ids)+1, dtype=np.int64)
+    np.cumsum(invalid_ids, out=invalid_sums[1:])
+
+    return invalid_ids, invalid_sums
+
+def get_invalid_index(index_dir: str='Inputs', max_digits=12, fix_num_rep=None):
+    # Load precomputed index of invalid IDs from disk as memory-mapped arrays, building and saving
+    # it first if it doesn't exist yet
+    name = f'Day2_Index_{max_digits}_{fix_num_rep or "all"}'
+    ids_file = os.path.join(index_dir, f'{name}_ids.npy')
+    sums_file = os.path.join(index_dir, f'{name}_sums.npy')
+    if not (os.path.exists(ids_file) and os.path.exists(sums_file)):
+        invalid_ids, invalid_sums = build_invalid_index(max_digits, fix_num_rep)
+        os.makedirs(index_dir, exist_ok=True)
+        np.save(ids_file, invalid_ids)
+        np.save(sums_file, invalid_sums)
+
+    return np.load(ids_file, mmap_mode='r'), np.load(sums_file, mmap_mode='r')
+
+def sum_invalid_indexed(id_range, invalid_index):
+    # Sum invalid IDs in range using precomputed sorted IDs and prefix sums
+    invalid_ids, invalid_sums = invalid_index
+    low, high = int(id_range[0]), int(id_range[1])
+    # Find positions of range bounds in sorted IDs and take difference of prefix sums
+    i = np.searchsorted(invalid_ids, low, side='left')
+    j = np.searchsorted(invalid_ids, high, side='right')
+
+    return int(invalid_sums[j] - invalid_sums[i])
+
+@time_function
+def Day2_Part1_Indexed(input_file: str='Inputs/Day2_Inputs.txt', index_dir: str='Inputs',
+                       max_digits=12) -> int:
+    # Parse input file and extract range bounds
+    id_ranges = get_input(input_file)
+    if max(h for _, h in id_ranges) >= 10**max_digits:
+        raise Exception(f"Ranges exceed {max_digits} digits covered by index!")
+    # Load index of invalid IDs with 2 segments
+    invalid_index = get_invalid_index(index_dir, max_digits, fix_num_rep=2)
+    # Sum invalid IDs from each range
+    return sum(sum_invalid_indexed(id_range, invalid_index) for id_range in id_ranges)
+
+@time_function
+def Day2_Part2_Indexed(input_file: str='Inputs/Day2_Inputs.txt', index_dir: str='Inputs',
+                       max_digits=12) -> int:
+    # Parse input file and extract range bounds
+    id_ranges = get_input(input_file)
+    if max(h for _, h in id_ranges) >= 10**max_digits:
+        raise Exception(f"Ranges exceed {max_digits} digits covered by index!")
+    # Load index of all invalid IDs
+    invalid_index = get_invalid_index(index_dir, max_digits)
+    # Sum invalid IDs from each range
+    return sum(sum_invalid_indexed(id_range, invalid_index) for id_range in id_ranges)
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+def split_range(id_range, chunk_size):
+    # Split range into balanced sub-ranges of at most chunk_size IDs
+    low, high = id_range
+    num_chunks = -(-(high - low + 1)//chunk_size)
+    size, extra = divmod(high - low + 1, num_chunks)
+    sub_ranges = []
+    for n in range(num_chunks):
+        # Spread remainder over first sub-ranges so sizes differ by at most one
+        sub_high = low + size + (n < extra) - 1
+        sub_ranges.append((low, sub_high))
+        low = sub_high + 1
+
+    return sub_ranges
+
+def sum_invalid_brute(id_range, fix_num_rep=None):
+    # Check every ID in range for invalidity and sum, returning number of IDs checked for progress
+    invalid_sum = 0
+    for i in range(id_range[0], id_range[1]+1):
+        # Option to fix number of repeated segments to 2 (for part 1)
+        if fix_num_rep == 2:
+            # Count number of digits in ID, and skip if not even length
+            id_len = (int(np.log10(i)))+1
+            if id_len%2:
+                continue
+            # Divide number in two and add to sum if the parts are equal
+            power = int(id_len/2)
+            if i%(10**power) == i//(10**power):
+                invalid_sum += i
+        elif is_invalid(i):
+            invalid_sum += i
+
+    return invalid_sum, id_range[1] - id_range[0] + 1
+
+def sum_invalid_parallel(id_ranges, fix_num_rep=None, max_workers=None, chunk_size=100000):
+    # Split all ranges into sub-ranges and check them across a pool of processes
+    sub_ranges = [s for id_range in id_ranges for s in split_range(id_range, chunk_size)]
+    invalid_sum = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(sum_invalid_brute, s, fix_num_rep) for s in sub_ranges]
+        # Combine partial sums and track progress over all IDs in a single bar
+        with tqdm(total=sum(h - l + 1 for l, h in id_ranges)) as pbar:
+            for future in as_completed(futures):
+                partial_sum, num_checked = future.result()
+                invalid_sum += partial_sum
+                pbar.update(num_checked)
+
+    return invalid_sum
+
+@time_function
+def Day2_Part1_Parallel(input_file: str='Inputs/Day2_Inputs.txt', max_workers=None,
+                        chunk_size=100000) -> int:
+    # Parse input file and extract range bounds
+    id_ranges = get_input(input_file)
+    # Sum invalid IDs across process pool, fix to 2 segments
+    return sum_invalid_parallel(id_ranges, 2, max_workers, chunk_size)
+
+@time_function
+def Day2_Part2_Parallel(input_file: str='Inputs/Day2_Inputs.txt', max_workers=None,
+                        chunk_size=100000) -> int:
+    # Parse input file and extract range bounds
+    id_ranges = get_input(input_file)
+    # Sum invalid IDs across process pool
+    return sum_invalid_parallel(id_ranges, None, max_workers, chunk_size)
+
+# Powers of ten covering the int64 range, used to count digits of whole arrays of IDs
+POWERS_10 = 10**np.arange(19, dtype=np.int64)
+
+def invalid_mask(ids, fix_num_rep=None):
+    # Check a whole block of int64 IDs for invalidity at once, returning boolean mask
+    # Count number of digits in every ID
+    id_lens = np.searchsorted(POWERS_10, ids, side='right')
+    mask = np.zeros(len(ids), dtype=bool)
+    for id_len in np.unique(id_lens):
+        id_len = int(id_len)
+        same_len = id_lens == id_len
+        # Option to fix number of repeated segments (for part 1)
+        if fix_num_rep:
+            if id_len%fix_num_rep:
+                continue
+            rep_lens = [id_len//fix_num_rep]
+        else:
+            rep_lens = [rep_len for rep_len in range(1, id_len) if not id_len%rep_len]
+        for rep_len in rep_lens:
+            power = POWERS_10[rep_len]
+            # Compare every segment against the lowest segment of each ID
+            seg = ids%power
+            equal = same_len.copy()
+            for n in range(1, id_len//rep_len):
+                equal &= (ids//POWERS_10[n*rep_len])%power == seg
+            mask |= equal
+
+    return mask
+
+def sum_invalid_batched(id_range, fix_num_rep=None, block_size=1 << 20):
+    # Check IDs in range in blocks of consecutive IDs as int64 arrays
+    invalid_sum = 0
+    for block_low in range(id_range[0], id_range[1]+1, block_size):
+        ids = np.arange(block_low, min(block_low + block_size, id_range[1]+1), dtype=np.int64)
+        # Sum invalid IDs in block as Python int to avoid overflow across blocks
+        invalid_sum += int(ids[invalid_mask(ids, fix_num_rep)].sum())
+
+    return invalid_sum
@@ -63,3 +63,155 @@ def Day3_Part2(input_file: str='Inputs/Day3_Inputs.txt') -> int:
         total_joltage += highest_joltage(bank, 12)
     
     return total_joltage
+
+def highest_joltage_stack(bank, num_batteries):
+    # Alternate approach using a monotonic stack for each number of batteries, in a single pass
+    # over the bank as raw bytes
+    if isinstance(bank, str):
+        bank = bank.encode()
+    # Option to find answers for several numbers of batteries at once
+    all_num_batteries = [num_batteries] if isinstance(num_batteries, int) else list(num_batteries)
+    stacks = [bytearray() for _ in all_num_batteries]
+    # Track how many digits can still be dropped for each number of batteries
+    drops = [len(bank) - k for k in all_num_batteries]
+    for b in bank:
+        for n, stack in enumerate(stacks):
+            # Drop smaller digits preceding this one while enough digits remain afterwards
+            while drops[n] and stack and stack[-1] < b:
+                stack.pop()
+                drops[n] -= 1
+            stack.append(b)
+
+    # Convert first digits of each stack to number
+    joltages = [int(stack[:k]) for stack, k in zip(stacks, all_num_batteries)]
+
+    return joltages[0] if isinstance(num_batteries, int) else joltages
+
+@time_function
+def Day3_Stack(input_file: str='Inputs/Day3_Inputs.txt') -> tuple:
+    # Parse input file and extract banks of batteries
+    banks = get_input(input_file)
+    total_joltages = [0, 0]
+    # Loop over and extract highest numbers possible with 2 and 12 digits in one pass, and sum
+    for bank in banks:
+        joltages = highest_joltage_stack(bank, (2, 12))
+        total_joltages = [t + j for t, j in zip(total_joltages, joltages)]
+
+    return tuple(total_joltages)
+
+import numpy as np
+
+def get_input_matrix(input_file: str='Inputs/Day3_Inputs.txt') -> tuple:
+    # Extract all banks from input file in one read as 2D matrix of digits, with length of each bank
+    with open(input_file, 'rb') as f:
+        data = f.read().replace(b'\r', b'')
+    if not data.endswith(b'\n'):
+        data += b'\n'
+    # If all banks have the same width and contain only digits, view file directly as
+    # fixed-width rows
+    flat = np.frombuffer(data, dtype=np.uint8)
+    width = data.index(b'\n')
+    if width and len(data)%(width+1) == 0 and (flat[width::width+1] == ord('\n')).all():
+        digits = flat.reshape(-1, width+1)[:, :width] - ord('0')
+        if (digits <= 9).all():
+            return digits, np.full(len(digits), width)
+    # Otherwise strip whitespace and scatter ragged banks into matrix padded with zeroes (lower
+    # than any digit)
+    banks = data.split()
+    if not banks:
+        return np.zeros((0, 0), dtype=np.uint8), np.zeros(0, dtype=np.int64)
+    lens = np.array([len(bank) for bank in banks])
+    flat = np.frombuffer(b''.join(banks), dtype=np.uint8) - ord('0')
+    rows = np.repeat(np.arange(len(banks)), lens)
+    cols = np.arange(len(flat)) - np.repeat(np.cumsum(lens) - lens, lens)
+    digits = np.zeros((len(banks), lens.max()), dtype=np.uint8)
+    digits[rows, cols] = flat
+
+    return digits, lens
+
+def highest_joltages_matrix(digits, lens, num_batteries):
+    # Run greedy digit selection for every bank at once
+    if not len(digits):
+        return np.zeros(0, dtype=np.int64)
+    cols = np.arange(digits.shape[1])
+    rows = np.arange(digits.shape[0])
+    joltages = np.zeros(len(digits), dtype=np.int64)
+    # Track position in each bank of prevous digit
+    pos_prev = np.full(len(digits), -1)
+    # Loop over total digits to extract, starting with the highest power of ten
+    for digit_pos in range(num_batteries):
+        # Mask each bank to window after previous digit position, leaving room for all remaining
+        # digits to be extracted afterwards
+        window = (cols > pos_prev[:, None]) & (cols < (lens - (num_batteries-digit_pos-1))[:, None])
+        # Find first position of maximum digit in each window
+        pos_prev = np.where(window, digits.astype(np.int8), -1).argmax(axis=1)
+        joltages = joltages*10 + digits[rows, pos_prev]
+
+    return joltages
+
+@time_function
+def Day3_Part1_Matrix(input_file: str='Inputs/Day3_Inputs.txt') -> int:
+    # Parse input file and extract matrix of banks
+    digits, lens = get_input_matrix(input_file)
+    # Extract highest number possible with 2 digits for every bank at once, and sum
+    return int(highest_joltages_matrix(digits, lens, 2).sum())
+
+@time_function
+def Day3_Part2_Matrix(input_file: str='Inputs/Day3_Inputs.txt') -> int:
+    # Parse input file and extract matrix of banks
+    digits, lens = get_input_matrix(input_file)
+    # Extract highest number possible with 12 digits for every bank at once, and sum
+    return int(highest_joltages_matrix(digits, lens, 12).sum())
+
+import mmap
+
+def stream_banks(input_file: str='Inputs/Day3_Inputs.txt', chunk_size: int=1 << 20):
+    # Lazily yield each bank in input file as its length and a generator of byte chunks, using a
+    # memory-mapped file so no bank is ever fully loaded into memory
+    with open(input_file, 'rb') as f:
+        # Empty files can't be memory-mapped
+        if not f.seek(0, 2):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < len(mm):
+                # Find end of bank, ignoring trailing whitespace
+                end = mm.find(b'\n', start)
+                next_start = len(mm) if end == -1 else end + 1
+                end = len(mm) if end == -1 else end
+                while end > start and mm[end-1:end].isspace():
+                    end -= 1
+                if end > start:
+                    yield end - start, (mm[pos:min(pos + chunk_size, end)]
+                                        for pos in range(start, end, chunk_size))
+                start = next_start
+
+def highest_joltage_streaming(chunks, bank_len, num_batteries):
+    # Select digits with a monotonic stack capped at num_batteries, so memory doesn't depend on
+    # length of bank
+    stack = bytearray()
+    # Track position in bank
+    i = 0
+    for chunk in chunks:
+        for b in chunk:
+            # Drop smaller digits preceding this one while enough digits remain afterwards
+            while stack and stack[-1] < b and len(stack) + bank_len - i > num_batteries:
+                stack.pop()
+            if len(stack) < num_batteries:
+                stack.append(b)
+            i += 1
+
+    # Convert digits to number
+    return int(stack)
+
+@time_function
+def Day3_Part1_Stream(input_file: str='Inputs/Day3_Inputs.txt', chunk_size: int=1 << 20) -> int:
+    # Stream banks from input file and extract highest number possible with 2 digits, and sum
+    return sum(highest_joltage_streaming(chunks, bank_len, 2)
+               for bank_len, chunks in stream_banks(input_file, chunk_size))
+
+@time_function
+def Day3_Part2_Stream(input_file: str='Inputs/Day3_Inputs.txt', chunk_size: int=1 << 20) -> int:
+    # Stream banks from input file and extract highest number possible with 12 digits, and sum
+    return sum(highest_joltage_streaming(chunks, bank_len, 12)
+               for bank_len, chunks in stream_banks(input_file, chunk_size))
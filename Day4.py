@@ -96,3 +96,161 @@ def Day4_Part2(input_file: str='Inputs/Day4_Inputs.txt') -> int:
     # print_rolls(rolls, accessible)
     
     return num_removed
+
+from collections import deque
+
+def peel_rolls(rolls):
+    # Remove accessible rolls in waves using a worklist, like a k-core decomposition, returning
+    # the number of rolls removed in each wave
+    # Count adjacent rolls once for every roll
+    neighbours = {roll: count_adjacent_rolls(rolls, roll) for roll in rolls}
+    # Queue all rolls accessible at the start as the first wave
+    wave = deque(roll for roll, n in neighbours.items() if n < 4)
+    queued = set(wave)
+    wave_sizes = []
+    while wave:
+        wave_sizes.append(len(wave))
+        next_wave = deque()
+        # Remove all rolls in wave before decrementing neighbours, matching removal in rounds
+        for roll in wave:
+            del neighbours[roll]
+        for r, c in wave:
+            # Only neighbours of removed rolls can become accessible
+            for d in DIRS:
+                adj = (r+d[0], c+d[1])
+                if adj in neighbours:
+                    neighbours[adj] -= 1
+                    # Queue neighbours which drop below 4 for the next wave
+                    if neighbours[adj] < 4 and adj not in queued:
+                        queued.add(adj)
+                        next_wave.append(adj)
+        wave = next_wave
+
+    return wave_sizes
+
+@time_function
+def Day4_Part2_Worklist(input_file: str='Inputs/Day4_Inputs.txt') -> int:
+    # Parse input file and extract coords of paper rolls
+    rolls = get_input(input_file)
+    # Peel accessible rolls and sum removals over all waves
+    return sum(peel_rolls(rolls))
+
+import numpy as np
+
+def get_input_grid(input_file: str='Inputs/Day4_Inputs.txt') -> np.ndarray:
+    # Extract dense grid of paper rolls from input file, 1 where there is a roll
+    with open(input_file, 'rb') as f:
+        lines = f.read().split()
+    # Pad any short rows with empty space
+    width = max(len(l) for l in lines)
+    grid = np.frombuffer(b''.join(l.ljust(width, b'.') for l in lines), dtype=np.uint8)
+
+    return (grid.reshape(len(lines), width) == ord('@')).astype(np.uint8)
+
+def count_adjacent_grid(grid):
+    # Count adjacent rolls for every cell at once, summing the eight shifted copies of the grid
+    padded = np.pad(grid, 1)
+    counts = np.zeros(grid.shape, dtype=np.uint8)
+    for d in DIRS:
+        counts += padded[1+d[0]:padded.shape[0]-1+d[0], 1+d[1]:padded.shape[1]-1+d[1]]
+
+    return counts
+
+@time_function
+def Day4_Part1_Grid(input_file: str='Inputs/Day4_Inputs.txt') -> int:
+    # Parse input file and extract grid of paper rolls
+    grid = get_input_grid(input_file)
+    # Count rolls with less than 4 adjacent rolls
+    return int(np.count_nonzero(grid & (count_adjacent_grid(grid) < 4)))
+
+@time_function
+def Day4_Part2_Grid(input_file: str='Inputs/Day4_Inputs.txt') -> int:
+    # Parse input file and extract grid of paper rolls
+    grid = get_input_grid(input_file)
+    counts = count_adjacent_grid(grid)
+    num_removed = 0
+    # While some rolls are accessible
+    while (accessible := grid & (counts < 4)).any():
+        # Remove whole wave of accessible rolls at once
+        num_removed += int(np.count_nonzero(accessible))
+        grid ^= accessible
+        # Only counts next to removed rolls change, so subtract adjacent removals
+        counts -= count_adjacent_grid(accessible)
+
+    return num_removed
+
+import mmap
+import tempfile
+
+def get_grid_shape(mm):
+    # Determine height and width of fixed-width grid in memory-mapped input file
+    width = mm.find(b'\n')
+    if width == -1:
+        return 1, len(mm)
+    # Last row may or may not end with a newline
+    if len(mm)%(width+1) not in (0, width):
+        raise Exception("Tiled mode requires all rows of grid to have the same width!")
+
+    return -(-len(mm)//(width+1)), width
+
+def read_band(mm, r0, r1, width):
+    # Extract rows [r0, r1) of grid from memory-mapped input file as dense array
+    # Last row may be unterminated, so pad with a newline
+    band = mm[r0*(width+1):r1*(width+1)].ljust((r1-r0)*(width+1), b'\n')
+    band = np.frombuffer(band, dtype=np.uint8).reshape(r1-r0, width+1)
+    # Check every row ends with a newline exactly width characters in
+    if (band[:, width] != ord('\n')).any() or (band[:, :width] == ord('\n')).any():
+        raise Exception("Tiled mode requires all rows of grid to have the same width!")
+
+    return (band[:, :width] == ord('@')).astype(np.uint8)
+
+@time_function
+def Day4_Part1_Tiled(input_file: str='Inputs/Day4_Inputs.txt', band_rows: int=1024) -> int:
+    num_accessible = 0
+    with open(input_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        height, width = get_grid_shape(mm)
+        # Loop over bands of rows
+        for r0 in range(0, height, band_rows):
+            r1 = min(r0 + band_rows, height)
+            # Read band with one row halo either side so adjacent rolls are counted at the edges
+            low, high = max(r0-1, 0), min(r1+1, height)
+            band = read_band(mm, low, high, width)
+            counts = count_adjacent_grid(band)
+            # Count rolls with less than 4 adjacent rolls, excluding halo
+            inner = slice(r0-low, r1-low)
+            num_accessible += int(np.count_nonzero(band[inner] & (counts[inner] < 4)))
+
+    return num_accessible
+
+@time_function
+def Day4_Part2_Tiled(input_file: str='Inputs/Day4_Inputs.txt', band_rows: int=1024) -> int:
+    num_removed = 0
+    with open(input_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+         tempfile.TemporaryFile() as tmp:
+        height, width = get_grid_shape(mm)
+        # Copy grid into disk-backed array which can be updated as rolls are removed
+        grid = np.memmap(tmp, dtype=np.uint8, mode='w+', shape=(height, width))
+        for r0 in range(0, height, band_rows):
+            grid[r0:r0+band_rows] = read_band(mm, r0, min(r0 + band_rows, height), width)
+        # The final set of rolls doesn't depend on removal order, so sweep through bands removing
+        # accessible rolls until a full sweep removes nothing
+        changed = True
+        while changed:
+            changed = False
+            for r0 in range(0, height, band_rows):
+                r1 = min(r0 + band_rows, height)
+                # Load band with one row halo either side, including removals from previous bands
+                low, high = max(r0-1, 0), min(r1+1, height)
+                band = np.array(grid[low:high])
+                inner = np.zeros(band.shape, dtype=np.uint8)
+                inner[r0-low:r1-low] = 1
+                # Remove waves of accessible rolls inside band until none remain, halo rows are
+                # only removed in their own band
+                while (accessible := band & inner & (count_adjacent_grid(band) < 4)).any():
+                    num_removed += int(np.count_nonzero(accessible))
+                    band ^= accessible
+                    changed = True
+                grid[r0:r1] = band[r0-low:r1-low]
+        del grid
+
+    return num_removed
@@ -58,10 +58,9 @@ def Day5_Part1(input_file: str='Inputs/Day5_Inputs.txt') -> int:
     
     return num_fresh
 
-@time_function
-def Day5_Part2(input_file: str='Inputs/Day5_Inputs.txt') -> int:
-    # Parse input file and extract fresh ID ranges and ingredient IDs
-    fresh_ranges, _ = get_input(input_file)
+def combine_ranges(fresh_ranges):
+    if not fresh_ranges:
+        return []
     # Sort ranges by starting value
     fresh_ranges = sorted(fresh_ranges, key=lambda x: x[0])
     # Create new list with overlapping ranges combined together, start with lowest range
@@ -75,7 +74,216 @@ def Day5_Part2(input_file: str='Inputs/Day5_Inputs.txt') -> int:
         else:
             combined_ranges.append([low, high])
 
+    return combined_ranges
+
+@time_function
+def Day5_Part2(input_file: str='Inputs/Day5_Inputs.txt') -> int:
+    # Parse input file and extract fresh ID ranges and ingredient IDs
+    fresh_ranges, _ = get_input(input_file)
+    # Combine overlapping ranges
+    combined_ranges = combine_ranges(fresh_ranges)
+
     # Sum total inclusive lengths of combined ranges
     num_all_fresh = sum(h - l + 1 for l, h in combined_ranges)
     
     return num_all_fresh
+
+from bisect import bisect_right
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def build_fresh_index(fresh_ranges):
+    # Build sorted index of disjoint fresh ID ranges, as separate arrays of low and high bounds
+    combined_ranges = combine_ranges(fresh_ranges)
+    lows = [l for l, _ in combined_ranges]
+    highs = [h for _, h in combined_ranges]
+    # Use arrays if NumPy is available, else keep as lists for bisect
+    if np is not None:
+        return np.array(lows, dtype=np.int64), np.array(highs, dtype=np.int64)
+
+    return lows, highs
+
+def count_fresh(fresh_index, ingredients):
+    # Count fresh ingredients by finding the last range starting at or below each ID, and
+    # checking the ID is within it
+    lows, highs = fresh_index
+    if not len(lows):
+        return 0
+    if np is not None:
+        ids = np.fromiter(ingredients, dtype=np.int64)
+        i = np.searchsorted(lows, ids, side='right') - 1
+        return int(np.count_nonzero((i >= 0) & (ids <= highs[i])))
+    num_fresh = 0
+    for ingredient in ingredients:
+        i = bisect_right(lows, ingredient) - 1
+        if i >= 0 and ingredient <= highs[i]:
+            num_fresh += 1
+
+    return num_fresh
+
+def get_ingredients(input_file: str='Inputs/Day5_Inputs.txt') -> set:
+    # Extract only ingredient IDs from input file, skipping over ranges without parsing them
+    with open(input_file) as f:
+        for l in f:
+            if not l.strip():
+                break
+        ingredients = {int(l) for l in f if l.strip()}
+
+    return ingredients
+
+@time_function
+def Day5_Part1_Indexed(input_file: str='Inputs/Day5_Inputs.txt', fresh_index=None) -> int:
+    # Reuse index built from another file, only extracting ingredient IDs
+    if fresh_index is not None:
+        ingredients = get_ingredients(input_file)
+    # Else parse input file and build index from fresh ID ranges
+    else:
+        fresh_ranges, ingredients = get_input(input_file)
+        fresh_index = build_fresh_index(fresh_ranges)
+    # Look up all ingredients at once
+    return count_fresh(fresh_index, ingredients)
+
+from bisect import bisect_left
+
+class FreshRanges:
+    def __init__(self, fresh_ranges=()):
+        # Store disjoint, non-adjacent ranges as sorted lists of low and high bounds, with running
+        # count of all fresh IDs
+        # Ranges are found with bisect in O(log n), but inserting into or deleting from the lists
+        # shifts their tail, which is O(n). This is a single memmove of pointers, and stays at a
+        # few microseconds per update even with a million ranges, much faster in practice than
+        # a balanced tree written in Python
+        self.lows, self.highs = [], []
+        self.num_fresh = 0
+        for low, high in fresh_ranges:
+            self.add_range(low, high)
+
+    def add_range(self, low, high):
+        # Find ranges overlapping or adjacent to new range
+        i = bisect_left(self.highs, low-1)
+        j = bisect_right(self.lows, high+1)
+        # Combine them with new range, and update count with newly covered IDs
+        if i < j:
+            self.num_fresh -= sum(h - l + 1 for l, h in zip(self.lows[i:j], self.highs[i:j]))
+            low, high = min(low, self.lows[i]), max(high, self.highs[j-1])
+        self.lows[i:j], self.highs[i:j] = [low], [high]
+        self.num_fresh += high - low + 1
+
+    def remove_range(self, low, high):
+        # Find ranges overlapping removed range
+        i = bisect_left(self.highs, low)
+        j = bisect_right(self.lows, high)
+        if i >= j:
+            return
+        # Keep any parts of the first and last ranges outside removed range
+        new_lows, new_highs = [], []
+        if self.lows[i] < low:
+            new_lows.append(self.lows[i])
+            new_highs.append(low-1)
+        if self.highs[j-1] > high:
+            new_lows.append(high+1)
+            new_highs.append(self.highs[j-1])
+        # Update count with IDs no longer covered
+        self.num_fresh -= sum(h - l + 1 for l, h in zip(self.lows[i:j], self.highs[i:j]))
+        self.num_fresh += sum(h - l + 1 for l, h in zip(new_lows, new_highs))
+        self.lows[i:j], self.highs[i:j] = new_lows, new_highs
+
+    def __contains__(self, ingredient):
+        # Check ID is within the last range starting at or below it
+        i = bisect_right(self.lows, ingredient) - 1
+        return i >= 0 and ingredient <= self.highs[i]
+
+@time_function
+def Day5_Part2_Dynamic(input_file: str='Inputs/Day5_Inputs.txt') -> int:
+    # Parse input file and extract fresh ID ranges
+    fresh_ranges, _ = get_input(input_file)
+    # Insert ranges one at a time, keeping running count of fresh IDs
+    return FreshRanges(fresh_ranges).num_fresh
+
+import heapq
+import tempfile
+from itertools import islice
+
+def stream_ranges(f):
+    # Lazily yield fresh ID ranges from open input file, stopping at first empty line
+    for l in f:
+        if not l.strip():
+            return
+        yield tuple(int(n) for n in l.strip().split('-'))
+
+def stream_ingredients(f):
+    # Lazily yield ingredient IDs from rest of open input file
+    for l in f:
+        if l.strip():
+            yield int(l)
+
+def read_spill(spill):
+    # Lazily yield tuples of numbers back from spill file
+    for l in spill:
+        yield tuple(int(n) for n in l.split())
+
+def external_sort(items, spill_size: int=1000000):
+    # Sort tuples of numbers (e.g. ranges) bigger than memory by sorting chunks into spill files,
+    # then merging them
+    spills = []
+    try:
+        while chunk := sorted(islice(items, spill_size)):
+            spill = tempfile.TemporaryFile('w+')
+            spill.writelines(' '.join(str(n) for n in item) + '\n' for item in chunk)
+            spill.seek(0)
+            spills.append(spill)
+        # Lazily k-way merge sorted spill files
+        yield from heapq.merge(*(read_spill(spill) for spill in spills))
+    finally:
+        for spill in spills:
+            spill.close()
+
+def combine_sorted_ranges(sorted_ranges):
+    # Lazily combine overlapping ranges from stream sorted by starting value
+    combined = None
+    for low, high in sorted_ranges:
+        # If next range starts within current one, extend this range
+        if combined and low <= combined[1]:
+            combined[1] = max(combined[1], high)
+        # Else current range is complete
+        else:
+            if combined:
+                yield tuple(combined)
+            combined = [low, high]
+    if combined:
+        yield tuple(combined)
+
+@time_function
+def Day5_Part1_Stream(input_file: str='Inputs/Day5_Inputs.txt', spill_size: int=1000000) -> int:
+    num_fresh = 0
+    with open(input_file) as f:
+        # Externally sort and combine ranges, reading the first so all ranges are read from the
+        # file before the ingredient IDs
+        combined_ranges = combine_sorted_ranges(external_sort(stream_ranges(f), spill_size))
+        fresh_range = next(combined_ranges, None)
+        # Externally sort ingredient IDs, so duplicates are adjacent and IDs can be swept
+        # through the sorted ranges in order
+        ingredients = external_sort(((i,) for i in stream_ingredients(f)), spill_size)
+        prev_ingredient = None
+        for (ingredient,) in ingredients:
+            # Skip duplicate IDs, counting each ID only once
+            if ingredient == prev_ingredient:
+                continue
+            prev_ingredient = ingredient
+            # Move on to first range not ending before the ID
+            while fresh_range and fresh_range[1] < ingredient:
+                fresh_range = next(combined_ranges, None)
+            # Count ID if it is within this range
+            if fresh_range and fresh_range[0] <= ingredient:
+                num_fresh += 1
+
+    return num_fresh
+
+@time_function
+def Day5_Part2_Stream(input_file: str='Inputs/Day5_Inputs.txt', spill_size: int=1000000) -> int:
+    with open(input_file) as f:
+        # Externally sort and combine ranges, summing total inclusive lengths as they are merged
+        return sum(h - l + 1 for l, h in
+                   combine_sorted_ranges(external_sort(stream_ranges(f), spill_size)))
@@ -56,34 +56,188 @@ def get_input(input_file: str='Inputs/Day6_Inputs.txt', cephalopod_math=False) -
 import operator
 from functools import reduce
 
-@time_function
-def Day6_Part1(input_file: str='Inputs/Day6_Inputs.txt') -> int:
-    # Parse input file and extract problems
-    problems = get_input(input_file)
+def product_tree(numbers):
+    # Multiply numbers in pairs, then pairs of products and so on, so big numbers are only
+    # multiplied by others of similar size
+    numbers = list(numbers)
+    while len(numbers) > 1:
+        numbers = [operator.mul(*numbers[i:i+2]) if i+1 < len(numbers) else numbers[i]
+                   for i in range(0, len(numbers), 2)]
+
+    return numbers[0]
+
+def solve_problems(problems, use_product_tree=False):
     grand_total = 0
     for problem in problems:
         # For each problem, find sum or product of numbers as required
         if problem[0] == '+':
             grand_total += sum(n for n in problem[1])
         elif problem[0] == '*':
-            grand_total += reduce(operator.mul, problem[1])
+            # Option to use balanced product tree for problems with many large numbers
+            if use_product_tree:
+                grand_total += product_tree(problem[1])
+            else:
+                grand_total += reduce(operator.mul, problem[1])
         else:
             raise Exception(f"Unrecognised operation {problem[0]}")
     
     return grand_total
 
+from concurrent.futures import ProcessPoolExecutor
+
+def solve_problems_parallel(problems, use_product_tree=False, max_workers=None, num_batches=64):
+    # Split problems into batches and solve across a pool of processes
+    if not problems:
+        return 0
+    batch_size = -(-len(problems)//num_batches)
+    batches = [problems[i:i+batch_size] for i in range(0, len(problems), batch_size)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # Sum partial grand totals from each batch
+        return sum(executor.map(solve_problems, batches, [use_product_tree]*len(batches)))
+
+def evaluate_problems(problems, use_product_tree=False, parallel=False, max_workers=None):
+    # Sum answers to all problems, with option to solve across a pool of processes
+    if parallel:
+        return solve_problems_parallel(problems, use_product_tree, max_workers)
+    return solve_problems(problems, use_product_tree)
+
+@time_function
+def Day6_Part1(input_file: str='Inputs/Day6_Inputs.txt', use_product_tree=False, parallel=False,
+               max_workers=None) -> int:
+    # Parse input file and extract problems
+    problems = get_input(input_file)
+    # Sum answers to all problems
+    return evaluate_problems(problems, use_product_tree, parallel, max_workers)
+
 @time_function
-def Day6_Part2(input_file: str='Inputs/Day6_Inputs.txt') -> int:
+def Day6_Part2(input_file: str='Inputs/Day6_Inputs.txt', use_product_tree=False, parallel=False,
+               max_workers=None) -> int:
     # Parse input file and extract problems usign cephalopod math format
     problems = get_input(input_file, cephalopod_math=True)
-    grand_total = 0
-    for problem in problems:
-        # For each problem, find sum or product of numbers as required
-        if problem[0] == '+':
-            grand_total += sum(n for n in problem[1])
-        elif problem[0] == '*':
-            grand_total += reduce(operator.mul, problem[1])
-        else:
-            raise Exception(f"Unrecognised operation {problem[0]}")
-    
-    return grand_total
+    # Sum answers to all problems
+    return evaluate_problems(problems, use_product_tree, parallel, max_workers)
+
+import numpy as np
+
+def get_input_columnar(input_file: str='Inputs/Day6_Inputs.txt', cephalopod_math=False) -> list:
+    # Extract problems from input file read into one buffer and viewed as a 2D grid of characters
+    with open(input_file, 'rb') as f:
+        data = f.read().rstrip(b'\r\n').replace(b'\r', b'') + b'\n'
+    # If all lines have the same width, view buffer directly as rows without copying
+    flat = np.frombuffer(data, dtype=np.uint8)
+    width = data.index(b'\n')
+    if len(data)%(width+1) == 0 and (flat[width::width+1] == ord('\n')).all():
+        grid = flat.reshape(-1, width+1)[:, :width]
+    # Otherwise pad any short lines with spaces so all rows have the same width
+    else:
+        lines = data[:-1].split(b'\n')
+        width = max(len(l) for l in lines)
+        grid = np.frombuffer(b''.join(l.ljust(width, b' ') for l in lines), dtype=np.uint8)
+        grid = grid.reshape(len(lines), width)
+
+    # Find start and end columns of each problem, separated by columns of spaces
+    not_blank = np.concatenate(([False], (grid != ord(' ')).any(axis=0), [False]))
+    bounds = np.flatnonzero(not_blank[1:] != not_blank[:-1]).reshape(-1, 2)
+    # Operation is the only non-space character in the last row of each problem
+    operations = [chr(o) for o in np.maximum.reduceat(grid[-1], bounds[:, 0])]
+
+    # Extract digits, avoiding overflow with Python ints if numbers can exceed int64
+    is_digit = (grid[:-1] >= ord('0')) & (grid[:-1] <= ord('9'))
+    widths = bounds[:, 1] - bounds[:, 0]
+    max_len = len(grid) - 1 if cephalopod_math else widths.max()
+    dtype = np.int64 if max_len <= 18 else object
+    digits = np.where(is_digit, grid[:-1].astype(np.int64) - ord('0'), 0).astype(dtype)
+
+    if not cephalopod_math:
+        # Build numbers along each row, where each digit is scaled by the number of digits after
+        # it in the same problem
+        cols = np.concatenate([np.arange(l, h) for l, h in bounds])
+        digits_left = np.cumsum(is_digit, axis=1)
+        digits_after = digits_left[:, bounds[:, 1]-1].repeat(widths, axis=1) - digits_left[:, cols]
+        scaled = digits[:, cols]*np.power(np.array(10, dtype=dtype), digits_after)
+        # Sum scaled digits within each problem
+        numbers = np.add.reduceat(scaled, np.cumsum(widths) - widths, axis=1)
+        return [[o, tuple(n.tolist())] for o, n in zip(operations, numbers.T)]
+
+    # If extracting using cephalopod math format, build numbers down each column in bulk
+    numbers = np.zeros(width, dtype=dtype)
+    for r in range(len(grid) - 1):
+        numbers = np.where(is_digit[r], numbers*10 + digits[r], numbers)
+    # Read problems and their columns from right-to-left
+    return [[o, tuple(numbers[l:h][::-1].tolist())]
+            for o, (l, h) in zip(operations[::-1], bounds[::-1])]
+
+@time_function
+def Day6_Part1_Columnar(input_file: str='Inputs/Day6_Inputs.txt', use_product_tree=False,
+                        parallel=False, max_workers=None) -> int:
+    # Parse input file and extract problems from column grid
+    problems = get_input_columnar(input_file)
+    # Sum answers to all problems
+    return evaluate_problems(problems, use_product_tree, parallel, max_workers)
+
+@time_function
+def Day6_Part2_Columnar(input_file: str='Inputs/Day6_Inputs.txt', use_product_tree=False,
+                        parallel=False, max_workers=None) -> int:
+    # Parse input file and extract problems from column grid using cephalopod math format
+    problems = get_input_columnar(input_file, cephalopod_math=True)
+    # Sum answers to all problems
+    return evaluate_problems(problems, use_product_tree, parallel, max_workers)
+
+import os
+
+def stream_problems(input_file: str='Inputs/Day6_Inputs.txt', cephalopod_math=False,
+                    stripe_width: int=4096):
+    # Lazily yield problems from input file, reading the worksheet in vertical stripes by seeking
+    # to each row, and yielding each problem as soon as the column separating it is reached
+    with open(input_file, 'rb') as f:
+        # Determine width of rows, which must all be the same, from first line
+        first_line = f.readline()
+        stride = len(first_line)
+        width = len(first_line.rstrip(b'\r\n'))
+        size = os.fstat(f.fileno()).st_size
+        if size%stride not in (0, width):
+            raise Exception("Streaming mode requires all lines of worksheet to have the same "
+                            "width!")
+        num_rows = -(-size//stride)
+        # Track columns of current problem
+        columns = []
+        for c0 in range(0, width+1, stripe_width):
+            # Read stripe from every row, with a blank column after the last column to end the
+            # last problem
+            rows = []
+            for r in range(num_rows):
+                f.seek(r*stride + c0)
+                row = f.read(min(stripe_width, width - c0))
+                rows.append(row.ljust(min(stripe_width, width+1 - c0)))
+            for column in zip(*rows):
+                column = bytes(column)
+                # Until empty column is reached, add column to problem
+                if column.strip():
+                    columns.append(column)
+                    continue
+                if not columns:
+                    continue
+                # Extract operation from last row
+                operation = b''.join(c[-1:] for c in columns).strip().decode()
+                if cephalopod_math:
+                    # Build numbers down each column, from right-to-left
+                    numbers = tuple(int(c[:-1].replace(b' ', b'')) for c in columns[::-1])
+                else:
+                    # Build numbers along each row
+                    numbers = tuple(int(b''.join(c[r:r+1] for c in columns))
+                                    for r in range(num_rows-1))
+                yield [operation, numbers]
+                columns = []
+
+@time_function
+def Day6_Part1_Stream(input_file: str='Inputs/Day6_Inputs.txt', use_product_tree=False,
+                      stripe_width: int=4096) -> int:
+    # Stream problems from input file and sum answers as they are read
+    return solve_problems(stream_problems(input_file, stripe_width=stripe_width), use_product_tree)
+
+@time_function
+def Day6_Part2_Stream(input_file: str='Inputs/Day6_Inputs.txt', use_product_tree=False,
+                      stripe_width: int=4096) -> int:
+    # Stream problems from input file using cephalopod math format and sum answers as they are read
+    return solve_problems(stream_problems(input_file, cephalopod_math=True,
+                                          stripe_width=stripe_width), use_product_tree)
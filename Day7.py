@@ -114,3 +114,114 @@ def Day7_Part2(input_file: str='Inputs/Day7_Inputs.txt') -> int:
 
     # Calculate total number of universes
     return sum(beams.values())
+
+import numpy as np
+
+def index_splitters(splitters, start):
+    # Index splitters below start by row, as sorted arrays of columns shifted so that the lowest
+    # column any beam can reach is 0, and return number of columns beams can reach
+    low = min(min(c for _, c in splitters), start[1]) - 1
+    high = max(max(c for _, c in splitters), start[1]) + 1
+    splitter_rows = defaultdict(list)
+    for r, c in splitters:
+        if r > start[0]:
+            splitter_rows[r].append(c - low)
+    # Beams only move sideways at splitters, so jump straight between rows containing them
+    rows = [np.array(sorted(splitter_rows[r])) for r in sorted(splitter_rows)]
+
+    return rows, low, high - low + 1
+
+@time_function
+def Day7_Part1_Indexed(input_file: str='Inputs/Day7_Inputs.txt') -> int:
+    # Parse input file and extract splitter and start positions
+    splitters, start = get_input(input_file)
+    rows, low, width = index_splitters(splitters, start)
+    # Track which columns have beams
+    beams = np.zeros(width, dtype=bool)
+    beams[start[1] - low] = True
+    # Count splits
+    num_splits = 0
+    for cols in rows:
+        # Find splitters hit by beams, and split these beams
+        hit = cols[beams[cols]]
+        num_splits += len(hit)
+        beams[hit] = False
+        beams[hit-1] = True
+        beams[hit+1] = True
+
+    return num_splits
+
+@time_function
+def Day7_Part2_Indexed(input_file: str='Inputs/Day7_Inputs.txt') -> int:
+    # Parse input file and extract splitter and start positions
+    splitters, start = get_input(input_file)
+    rows, low, width = index_splitters(splitters, start)
+    # Track number of universes with a beam in each column, as Python ints to avoid overflow
+    beams = np.zeros(width, dtype=object)
+    beams[start[1] - low] = 1
+    for cols in rows:
+        # Split universes hitting splitters, adding number of current universes to each side
+        hit = beams[cols]
+        beams[cols] = 0
+        np.add.at(beams, cols-1, hit)
+        np.add.at(beams, cols+1, hit)
+
+    # Calculate total number of universes
+    return int(beams.sum())
+
+@time_function
+def Day7_Part1_Bitmask(input_file: str='Inputs/Day7_Inputs.txt') -> int:
+    # Parse input file and extract splitter and start positions
+    splitters, start = get_input(input_file)
+    # Build bitmask of splitter columns for each row below start, shifting columns so the lowest
+    # column any beam can reach is bit 0
+    low = min(min(c for _, c in splitters), start[1]) - 1
+    splitter_masks = defaultdict(int)
+    for r, c in splitters:
+        if r > start[0]:
+            splitter_masks[r] |= 1 << (c - low)
+    # Track columns with beams as bits of a single int
+    beams = 1 << (start[1] - low)
+    # Count splits
+    num_splits = 0
+    for r in sorted(splitter_masks):
+        # Find splitters hit by beams, and replace these beams with beams either side
+        hit = beams & splitter_masks[r]
+        num_splits += hit.bit_count()
+        beams = (beams & ~hit) | (hit << 1) | (hit >> 1)
+
+    return num_splits
+
+def timeline_table(splitters, start_row: int):
+    # Sweep bottom-up once to find number of timelines reaching the exit for a beam starting in
+    # each column of the start row, so the table can be kept and reused for any start column
+    # Use a splitter column as start column so reachable columns only depend on splitters
+    rows, low, width = index_splitters(splitters, (start_row, min(c for _, c in splitters)))
+    # Beams which don't hit any more splitters are a single timeline
+    timelines = np.ones(width, dtype=object)
+    for cols in reversed(rows):
+        # Beams hitting a splitter have the timelines of both sides below it
+        timelines[cols] = timelines[cols-1] + timelines[cols+1]
+    # Make table read-only so it can be safely shared between lookups
+    timelines.flags.writeable = False
+
+    return timelines, low
+
+def lookup_timelines(table, start_cols):
+    # Look up number of timelines for one or many start columns at once from precomputed table
+    timelines, low = table
+    cols = np.atleast_1d(start_cols) - low
+    # Columns outside table never hit a splitter
+    inside = (cols >= 0) & (cols < len(timelines))
+    counts = np.ones(len(cols), dtype=object)
+    counts[inside] = timelines[cols[inside]]
+
+    return counts
+
+@time_function
+def Day7_Part2_Table(input_file: str='Inputs/Day7_Inputs.txt') -> int:
+    # Parse input file and extract splitter and start positions
+    splitters, start = get_input(input_file)
+    # Look up number of timelines from start position in precomputed table
+    table = timeline_table(splitters, start[0])
+    return int(lookup_timelines(table, start[1])[0])
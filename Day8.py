@@ -18,11 +18,17 @@ def time_function(func):
         return out
     return wrapper
 
-def get_input(input_file: str='Inputs/Day8_Inputs.txt') -> list:
+def get_boxes(input_file: str='Inputs/Day8_Inputs.txt') -> list:
     # Extract box coordinates from input file
     with open(input_file) as f:
         boxes = [tuple(int(i) for i in l.strip().split(',')) for l in f.readlines()]
 
+    return boxes
+
+def get_input(input_file: str='Inputs/Day8_Inputs.txt') -> list:
+    # Extract box coordinates from input file
+    boxes = get_boxes(input_file)
+
     # Determine distances between each box and every other box and store in dict
     dist_to_box = dict()
     for n in range(len(boxes)):
@@ -37,98 +43,236 @@ def get_input(input_file: str='Inputs/Day8_Inputs.txt') -> list:
 
     return boxes, dist_to_box
 
+import heapq
+
+def edge_stream(boxes, dist_to_box):
+    # Lazily yield pairs of boxes in order of increasing distance, using a heap holding the next
+    # closest neighbour of each box
+    box_index = {b: n for n, b in enumerate(boxes)}
+    # Start with closest neighbour of every box, tracking position in its sorted distance list
+    heap = [(dist_to_box[b][0][1], n, 0) for n, b in enumerate(boxes) if dist_to_box[b]]
+    heapq.heapify(heap)
+    while heap:
+        dist, n, k = heapq.heappop(heap)
+        box = boxes[n]
+        neighbour = dist_to_box[box][k][0]
+        # Refill heap with next closest neighbour of this box
+        if k+1 < len(dist_to_box[box]):
+            heapq.heappush(heap, (dist_to_box[box][k+1][1], n, k+1))
+        # Each pair appears in both boxes' distance lists, so only yield it once
+        if n < box_index[neighbour]:
+            yield box, neighbour
+
+import numpy as np
+from collections import defaultdict
+
+def build_grid(coords, neighbours):
+    # Bucket boxes into a uniform 3D grid of cubic cells, sized to hold roughly the given number
+    # of boxes each
+    extent = max(int((coords.max(axis=0) - coords.min(axis=0)).max()), 1)
+    cell_size = max(int(np.ceil(extent*(neighbours/len(coords))**(1/3))), 1)
+    cells = coords//cell_size
+    grid = defaultdict(list)
+    for n, cell in enumerate(map(tuple, cells.tolist())):
+        grid[cell].append(n)
+    grid = {cell: np.array(members) for cell, members in grid.items()}
+    # Find bounds of occupied cells, so searches know when every box has been reached
+    cell_bounds = (cells.min(axis=0), cells.max(axis=0))
+
+    return grid, cells, cell_size, cell_bounds
+
+def shell_cells(cell, shell):
+    # Yield cells on the surface of the cube of cells this far from the given cell
+    x, y, z = cell
+    for dx in range(-shell, shell+1):
+        for dy in range(-shell, shell+1):
+            # Away from the faces in x and y, only the top and bottom cells are on the surface
+            if abs(dx) == shell or abs(dy) == shell:
+                dzs = range(-shell, shell+1)
+            else:
+                dzs = (-shell, shell) if shell else (0,)
+            for dz in dzs:
+                yield x+dx, y+dy, z+dz
+
+def nearest_neighbours(coords, grid, cells, cell_size, cell_bounds, n, k):
+    # Find the k nearest neighbours of box n, ordered by distance then index, by searching shells
+    # of grid cells of increasing size around it
+    cell = cells[n]
+    # Furthest shell containing any occupied cell
+    max_shell = int(max((cell - cell_bounds[0]).max(), (cell_bounds[1] - cell).max()))
+    cell = tuple(cell.tolist())
+    candidates = []
+    shell = 0
+    while True:
+        # Add boxes in cells on the surface of the cube of cells this far from the box's cell
+        candidates.extend(grid[c] for c in shell_cells(cell, shell) if c in grid)
+        members = np.concatenate(candidates)
+        members = members[members != n]
+        dists = ((coords[members] - coords[n])**2).sum(axis=1)
+        # Boxes outside the searched cube are at least this far away, so candidates within this
+        # distance are confirmed to be the closest
+        confirmed = dists <= (shell*cell_size)**2
+        if confirmed.sum() >= k or shell >= max_shell:
+            break
+        shell += 1
+    # Sort by distance, then index so ties are ordered the same if neighbours are widened
+    if shell < max_shell:
+        members, dists = members[confirmed], dists[confirmed]
+    order = np.lexsort((members, dists))[:k]
+
+    return list(zip(dists[order].tolist(), members[order].tolist()))
+
+def knn_edge_stream(boxes, neighbours=16):
+    # Lazily yield pairs of boxes in order of increasing distance, using a heap holding the next
+    # closest neighbour of each box, from lists of nearest neighbours widened as they run out
+    coords = np.array(boxes, dtype=np.int64)
+    grid, cells, cell_size, cell_bounds = build_grid(coords, neighbours)
+    nearest = [nearest_neighbours(coords, grid, cells, cell_size, cell_bounds, n, neighbours)
+               for n in range(len(boxes))]
+    # Start with closest neighbour of every box, tracking position in its distance list
+    heap = [(nearest[n][0][0], n, 0) for n in range(len(boxes)) if nearest[n]]
+    heapq.heapify(heap)
+    while heap:
+        dist, n, k = heapq.heappop(heap)
+        neighbour = nearest[n][k][1]
+        # If all found neighbours of this box are used, find twice as many
+        if k+1 == len(nearest[n]) and k+1 < len(boxes) - 1:
+            nearest[n] = nearest_neighbours(coords, grid, cells, cell_size, cell_bounds, n,
+                                            2*(k+1))
+        # Refill heap with next closest neighbour of this box
+        if k+1 < len(nearest[n]):
+            heapq.heappush(heap, (nearest[n][k+1][0], n, k+1))
+        # Each pair appears in both boxes' neighbour lists, so only yield it once
+        if n < neighbour:
+            yield boxes[n], boxes[neighbour]
+
+def find(x, graph):
+    # Find root box of circuit containing x
+    root = x
+    while graph[root] != root:
+        root = graph[root]
+    # Point every box on the path directly at the root, so later searches are shorter
+    while graph[x] != root:
+        graph[x], x = root, graph[x]
+
+    return root
+
+def union(x, y, graph, sizes):
+    # Join circuits containing x and y, returning whether they were separate circuits
+    x, y = find(x, graph), find(y, graph)
+    if x == y:
+        return False
+    # Attach smaller circuit to the root of the larger one, sizes only holds circuit roots so its
+    # length is the number of circuits
+    if sizes[x] < sizes[y]:
+        x, y = y, x
+    graph[y] = x
+    sizes[x] += sizes.pop(y)
+
+    return True
+
 import operator
 from functools import reduce
 
 @time_function
-def Day8_Part1(input_file: str='Inputs/Day8_Inputs.txt') -> int:
-    # Parse input file and extract box coordinates and distances between boxes
-    boxes, dist_to_box = get_input(input_file)
-
+def Day8_Part1(input_file: str='Inputs/Day8_Inputs.txt', neighbours: int=None) -> int:
+    # Option to stream pairs of boxes in order of increasing distance from nearest neighbours of
+    # each box, without finding distances between every pair
+    if neighbours:
+        boxes = get_boxes(input_file)
+        edges = knn_edge_stream(boxes, neighbours)
+    else:
+        # Parse input file and extract box coordinates and distances between boxes
+        boxes, dist_to_box = get_input(input_file)
+        # Stream pairs of boxes in order of increasing distance
+        edges = edge_stream(boxes, dist_to_box)
     connections = 0
-    # Assign circuit index to each box
-    circuits = {b: n for n, b in enumerate(boxes)}
+    # Start with each box in its own circuit, tracking size of each circuit by its root box
+    circuits = {b: b for b in boxes}
+    sizes = {b: 1 for b in boxes}
     # Until 1000 connections are made
     while connections < 1000:
-        # Find box with shortest distance to closest neighbour
-        closest_box = min(boxes, key=lambda b: dist_to_box[b][0][1])
-        # Get closest neighbour
-        neighbour = dist_to_box[closest_box][0][0]
-        # Remove pair from each other's distance list
-        for b in [closest_box, neighbour]:
-            dist_to_box[b].pop(0)
-        # If they were not in the same circuit already
-        if circuits[closest_box] != circuits[neighbour]:
-            joined_circuit = min(circuits[closest_box], circuits[neighbour])
-            removed_circuit = max(circuits[closest_box], circuits[neighbour])
-            # Assign the same circuit index to all boxes in both circuits
-            for cb in [cb for cb, n in circuits.items() if n == removed_circuit]:
-                circuits[cb] = joined_circuit
+        # Get next closest pair of boxes
+        closest_box, neighbour = next(edges)
+        # Join their circuits, if they were not in the same circuit already
+        union(closest_box, neighbour, circuits, sizes)
         connections += 1
 
-    # Determine sizes of all circuits
-    all_circuits = list(circuits.values())
-    circuit_sizes = sorted([all_circuits.count(size) for size in set(all_circuits)], reverse=True)
+    # Determine sizes of three largest circuits
+    circuit_sizes = heapq.nlargest(3, sizes.values())
 
     # Find product of top three
     return reduce(operator.mul, circuit_sizes[:3])
 
 @time_function
-def Day8_Part2(input_file: str='Inputs/Day8_Inputs.txt') -> int:
-    # Parse input file and extract box coordinates and distances between boxes
-    boxes, dist_to_box = get_input(input_file)
-
+def Day8_Part2(input_file: str='Inputs/Day8_Inputs.txt', neighbours: int=None) -> int:
+    # Option to stream pairs of boxes in order of increasing distance from nearest neighbours of
+    # each box, without finding distances between every pair
+    if neighbours:
+        boxes = get_boxes(input_file)
+        edges = knn_edge_stream(boxes, neighbours)
+    else:
+        # Parse input file and extract box coordinates and distances between boxes
+        boxes, dist_to_box = get_input(input_file)
+        # Stream pairs of boxes in order of increasing distance
+        edges = edge_stream(boxes, dist_to_box)
     connections = 0
-    # Assign circuit index to each box
-    circuits = {b: n for n, b in enumerate(boxes)}
+    # Start with each box in its own circuit, tracking size of each circuit by its root box
+    circuits = {b: b for b in boxes}
+    sizes = {b: 1 for b in boxes}
     # Until there is only one circuit
-    while len(set(circuits.values())) > 1:
-        # Find box with shortest distance to closest neighbour
-        closest_box = min(boxes, key=lambda b: dist_to_box[b][0][1])
-        # Get closest neighbour
-        neighbour = dist_to_box[closest_box][0][0]
-        # Remove pair from each other's distance list
-        for b in [closest_box, neighbour]:
-            dist_to_box[b].pop(0)
-        # If they were not in the same circuit already
-        if circuits[closest_box] != circuits[neighbour]:
-            joined_circuit = min(circuits[closest_box], circuits[neighbour])
-            removed_circuit = max(circuits[closest_box], circuits[neighbour])
-            # Assign the same circuit index to all boxes in both circuits
-            for cb in [cb for cb, n in circuits.items() if n == removed_circuit]:
-                circuits[cb] = joined_circuit
+    while len(sizes) > 1:
+        # Get next closest pair of boxes
+        closest_box, neighbour = next(edges)
+        # Join their circuits, if they were not in the same circuit already
+        union(closest_box, neighbour, circuits, sizes)
         connections += 1
 
     # Multiply x-coordinates of final two connected boxes
     return closest_box[0]*neighbour[0]
 
-def find(x, graph):
-    if graph[x] == x:
-        return x
-    else:
-        return find(graph[x], graph)
-
-def union(x, y, graph):
-    graph[find(y, graph)] = find(x, graph)
-
-    return graph
+def closest_pairs(coords, num_pairs=1000, block_size=1024):
+    # Find the closest pairs of boxes, computing distances between blocks of boxes at a time and
+    # keeping a running selection of the closest pairs found so far
+    best_dists = np.empty(0, dtype=np.int64)
+    best_pairs = np.empty((0, 2), dtype=np.int64)
+    for i0 in range(0, len(coords), block_size):
+        rows = np.arange(i0, min(i0 + block_size, len(coords)))
+        # Only compare against boxes after these, so each pair is found once
+        for j0 in range(i0, len(coords), block_size):
+            cols = np.arange(j0, min(j0 + block_size, len(coords)))
+            dists = ((coords[rows, None, :] - coords[None, cols, :])**2).sum(axis=2)
+            i, j = np.nonzero(rows[:, None] < cols[None, :])
+            # Combine pairs from this block with closest pairs so far
+            best_dists = np.concatenate((best_dists, dists[i, j]))
+            best_pairs = np.concatenate((best_pairs, np.stack((rows[i], cols[j]), axis=1)))
+            # Keep only the closest pairs, without fully sorting
+            if len(best_dists) > num_pairs:
+                # Keep all pairs closer than the furthest pair kept, then break ties at that
+                # distance by box indices, matching the order pairs come from edge_stream
+                max_dist = np.partition(best_dists, num_pairs-1)[num_pairs-1]
+                closer = np.flatnonzero(best_dists < max_dist)
+                tied = np.flatnonzero(best_dists == max_dist)
+                tied = tied[np.lexsort((best_pairs[tied, 1], best_pairs[tied, 0]))]
+                keep = np.concatenate((closer, tied[:num_pairs - len(closer)]))
+                best_dists, best_pairs = best_dists[keep], best_pairs[keep]
+    # Sort final selection of pairs by distance, then box indices
+    order = np.lexsort((best_pairs[:, 1], best_pairs[:, 0], best_dists))
 
-# input_file: str='Inputs/Day8_Inputs.txt'
-# # Parse input file and extract box coordinates
-# boxes, dist_to_box = get_input(input_file)
+    return best_pairs[order]
 
-# circuits = {b: b for b in boxes}
-
-# connections = 0
-# while connections < 1000:
-#     # Find closest pair of boxes
-#     box1, box2 = dist_to_box.pop(0)[0]
-#     circuits = union(box1, box2, circuits)
-#     connections += 1
-
-# # Determine sizes of all circuits
-# all_circuits = list(find(b, circuits) for b in boxes)
-# circuit_sizes = sorted([all_circuits.count(size) for size in set(all_circuits)], reverse=True)
+@time_function
+def Day8_Part1_Blocked(input_file: str='Inputs/Day8_Inputs.txt', num_connections: int=1000,
+                       block_size: int=1024) -> int:
+    # Parse input file and extract box coordinates
+    boxes = get_boxes(input_file)
+    # Start with each box in its own circuit, tracking size of each circuit by its root box
+    circuits = {b: b for b in boxes}
+    sizes = {b: 1 for b in boxes}
+    # Join circuits of the given number of closest pairs of boxes
+    pairs = closest_pairs(np.array(boxes, dtype=np.int64), num_connections, block_size)
+    for n, m in pairs.tolist():
+        union(boxes[n], boxes[m], circuits, sizes)
 
-# # Find product of top three
-# print(reduce(operator.mul, circuit_sizes[:3]))
+    # Find product of sizes of three largest circuits
+    return reduce(operator.mul, heapq.nlargest(3, sizes.values()))